@@ -0,0 +1,18 @@
+import importlib.machinery
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parent.parent / "0.21"
+
+
+@pytest.fixture(scope="session")
+def vg():
+    """The VisageGuard script loaded as a module (it has no .py extension)"""
+    for module in ("cv2", "dlib", "cryptography"):
+        pytest.importorskip(module)
+    loader = importlib.machinery.SourceFileLoader("visageguard", str(SCRIPT))
+    module = importlib.util.module_from_spec(importlib.util.spec_from_loader("visageguard", loader))
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,46 @@
+def analyzed_frames(vg, skipper, frames=300):
+    analyzed = 0
+    for index in range(frames):
+        # Fast replay: frames arrive every 0.4 ms of wall-clock time and analysis looks expensive
+        if skipper.should_process(index * 0.0004):
+            analyzed += 1
+            skipper.record(0.01, 0.5, face_present=True)
+    return analyzed
+
+
+def test_fast_replay_uses_the_configured_skip(vg):
+    config = vg.ConfigManager().default_config
+    runs = [analyzed_frames(vg, vg.FrameSkipController(config, fixed=True)) for _ in range(2)]
+    assert runs == [100, 100]
+
+
+def test_adaptive_skip_backs_off_under_load(vg):
+    config = vg.ConfigManager().default_config
+    assert analyzed_frames(vg, vg.FrameSkipController(config)) < 100
+
+
+def test_adaptive_skip_recovers_when_load_drops(vg):
+    config = vg.ConfigManager().default_config
+    skipper = vg.FrameSkipController(config)
+    analyzed_frames(vg, skipper)
+    assert skipper.skip > 1
+
+    # Frames every 33 ms that take 1 ms to analyze are far below the CPU share and latency budget
+    timestamp = 1.0
+    for _ in range(300):
+        timestamp += 0.033
+        if skipper.should_process(timestamp):
+            skipper.record(0.001, 0.01, face_present=True)
+    assert skipper.skip == 1
+
+
+def test_face_change_analyzes_every_frame(vg):
+    config = dict(vg.ConfigManager().default_config, adaptive_frame_skip=False, frame_skip=3)
+    skipper = vg.FrameSkipController(config)
+    assert skipper.current_skip == 3
+    skipper.record(0.01, 0.05, face_present=True)
+    skipper.record(0.01, 0.05, face_present=False)
+    assert skipper.current_skip == 1
+    for _ in range(vg.FRAME_SKIP_BOOST_FRAMES):
+        skipper.record(0.01, 0.05, face_present=False)
+    assert skipper.current_skip == 3
@@ -0,0 +1,164 @@
+import numpy as np
+import pytest
+
+
+def synthetic_users(users_count=40, templates_per_user=5, seed=0):
+    """Users with descriptors spread roughly like real ones: ~0.4 within a person, ~0.8 between people"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(0.0, 0.05, (users_count, 128))
+    return {f"user{i}": list(centers[i] + rng.normal(0.0, 0.025, (templates_per_user, 128)))
+            for i in range(users_count)}
+
+
+def probes_for(users, count=30, seed=1):
+    """Noisy copies of enrolled templates and strangers, as float64 like face_recognition returns them"""
+    rng = np.random.default_rng(seed)
+    templates = np.asarray([encoding for encodings in users.values() for encoding in encodings])
+    known = templates[rng.integers(0, len(templates), count // 2)] + rng.normal(0.0, 0.02, (count // 2, 128))
+    return np.vstack([known, rng.normal(0.0, 0.05, (count - count // 2, 128))])
+
+
+def brute_force(users, probe):
+    """(name, distance) of every user's closest template, closest user first"""
+    per_user = [(name, float(np.linalg.norm(np.asarray(encodings) - probe, axis=1).min()))
+                for name, encodings in users.items()]
+    return sorted(per_user, key=lambda candidate: candidate[1])
+
+
+def test_gallery_matches_brute_force(vg):
+    users = synthetic_users()
+    gallery = vg.FaceGallery(users, prefilter=False)
+    templates = np.asarray([encoding for encodings in users.values() for encoding in encodings])
+    for probe in probes_for(users):
+        expected = brute_force(users, probe)
+        assert gallery.distances(probe) == pytest.approx(np.linalg.norm(templates - probe, axis=1), abs=1e-5)
+        match = gallery.nearest(probe, top_k=3)
+        assert [name for name, _ in match.candidates] == [name for name, _ in expected[:3]]
+        assert match.distance == pytest.approx(expected[0][1], abs=1e-5)
+
+
+def test_nearest_reports_margin_and_tolerance(vg):
+    users = synthetic_users()
+    gallery = vg.FaceGallery(users, prefilter=False)
+    probe = probes_for(users)[0]
+    expected = brute_force(users, probe)
+
+    match = gallery.nearest(probe)
+    assert match.margin == pytest.approx(expected[1][1] - expected[0][1], abs=1e-5)
+    # A runner-up beyond max_distance counts as being at max_distance
+    limit = (expected[0][1] + expected[1][1]) / 2
+    assert gallery.nearest(probe, max_distance=limit).margin == pytest.approx(limit - expected[0][1], abs=1e-5)
+    assert gallery.nearest(probe, max_distance=expected[0][1] - 0.01) is None
+
+
+def test_prefilter_gives_the_full_scan_result(vg):
+    users = synthetic_users(users_count=200)
+    full, pruned = vg.FaceGallery(users, prefilter=False), vg.FaceGallery(users)
+    comparisons = 0
+    for probe in probes_for(users, count=60):
+        for max_distance in (None, 0.3):
+            expected = full.nearest(probe, top_k=2, max_distance=max_distance)
+            found = pruned.nearest(probe, top_k=2, max_distance=max_distance)
+            if expected is None:
+                assert found is None
+                continue
+            assert [name for name, _ in found.candidates] == [name for name, _ in expected.candidates]
+            assert found.distance == pytest.approx(expected.distance, abs=1e-5)
+            assert found.margin == pytest.approx(expected.margin, abs=1e-5)
+        comparisons += pruned.last_comparisons
+    # Only a fraction of the templates had to be compared with the tolerance in place
+    assert comparisons < 60 * len(full) / 2
+
+
+@pytest.mark.parametrize("precision", ["float16", "int8"])
+def test_reduced_precision_keeps_float64_decisions(vg, precision):
+    users = synthetic_users(users_count=200)
+    gallery = vg.FaceGallery(users, prefilter=False, precision=precision)
+    assert gallery.matrix.dtype == np.dtype(precision)
+    assert gallery.nbytes < vg.FaceGallery(users, prefilter=False).nbytes
+    for probe in probes_for(users, count=60):
+        expected = brute_force(users, probe)[0]
+        match = gallery.nearest(probe)
+        assert match.name == expected[0]
+        assert match.distance == pytest.approx(expected[1], abs=0.01)
+
+
+@pytest.mark.parametrize("prefilter", [False, True])
+def test_nearest_many_matches_nearest(vg, prefilter):
+    users = synthetic_users(users_count=100)
+    gallery = vg.FaceGallery(users, prefilter=prefilter)
+    probes = probes_for(users, count=12)
+    for max_distance in (None, 0.3):
+        batched = gallery.nearest_many(probes, top_k=2, max_distance=max_distance)
+        assert len(batched) == len(probes)
+        for probe, found in zip(probes, batched):
+            expected = gallery.nearest(probe, top_k=2, max_distance=max_distance)
+            if expected is None:
+                assert found is None
+                continue
+            assert [name for name, _ in found.candidates] == [name for name, _ in expected.candidates]
+            assert found.distance == pytest.approx(expected.distance, abs=1e-5)
+            assert found.margin == pytest.approx(expected.margin, abs=1e-5)
+    assert gallery.nearest_many(np.empty((0, 128))) == []
+
+
+def build_index(vg, users, nlist=8):
+    index = vg.IvfIndex(nlist)
+    index.train(np.asarray([encoding for encodings in users.values() for encoding in encodings]))
+    for name, encodings in users.items():
+        index.add(name, encodings)
+    return index
+
+
+def test_ivf_scanning_every_list_is_exact(vg):
+    users = synthetic_users()
+    index = build_index(vg, users)
+    restored = vg.IvfIndex.from_dict(index.to_dict(), users)
+    for probe in probes_for(users):
+        expected = brute_force(users, probe)[:2]
+        for searched in (index, restored):
+            match = searched.search(probe, top_k=2, nprobe=index.nlist)
+            assert [name for name, _ in match.candidates] == [name for name, _ in expected]
+            assert match.distance == pytest.approx(expected[0][1], abs=1e-5)
+
+
+def test_ivf_recall_on_a_few_lists(vg):
+    users = synthetic_users(users_count=200)
+    index = build_index(vg, users, nlist=16)
+    probes = probes_for(users, count=100)[:50]
+    found = [index.search(probe, nprobe=4).name for probe in probes]
+    assert np.mean([name == brute_force(users, probe)[0][0] for name, probe in zip(found, probes)]) >= 0.9
+
+
+def test_ivf_reenrolls_in_place(vg):
+    users = synthetic_users()
+    index = build_index(vg, users)
+    assert index.remove("user0") == len(users["user0"])
+    assert len(index) == sum(len(encodings) for encodings in users.values()) - len(users["user0"])
+    assert all(match.name != "user0" for match in (index.search(encoding, nprobe=index.nlist)
+                                                   for encoding in users["user0"]))
+    index.add("user0", users["user0"])
+    assert index.search(users["user0"][0], nprobe=index.nlist).name == "user0"
+    # A stored index no longer matching the enrolled users is rejected
+    del users["user1"]
+    assert vg.IvfIndex.from_dict(index.to_dict(), users) is None
+
+
+@pytest.mark.parametrize("precision", ["float16", "int8"])
+def test_pq_with_full_rerank_matches_exact_gallery(vg, precision):
+    users = synthetic_users()
+    exact = vg.FaceGallery(users, prefilter=False, precision=precision)
+    gallery = vg.PqGallery(users, vg.ProductQuantizer(16), rerank=len(exact), precision=precision)
+    for probe in probes_for(users):
+        expected, found = exact.nearest(probe, top_k=3), gallery.nearest(probe, top_k=3)
+        assert [name for name, _ in found.candidates] == [name for name, _ in expected.candidates]
+        assert [distance for _, distance in found.candidates] == pytest.approx(
+            [distance for _, distance in expected.candidates], abs=1e-4)
+
+
+@pytest.mark.parametrize("precision", ["float16", "int8"])
+def test_pq_is_smaller_than_flat_float32_gallery(vg, precision):
+    users = synthetic_users(users_count=500)
+    flat = vg.FaceGallery(users, prefilter=False)
+    gallery = vg.PqGallery(users, vg.ProductQuantizer(16), precision=precision)
+    assert gallery.nbytes < flat.nbytes
@@ -0,0 +1,16 @@
+import subprocess
+import sys
+
+from conftest import SCRIPT
+
+LOAD_SCRIPT = f"""
+import importlib.machinery, importlib.util, sys
+loader = importlib.machinery.SourceFileLoader("visageguard", {str(SCRIPT)!r})
+loader.exec_module(importlib.util.module_from_spec(importlib.util.spec_from_loader("visageguard", loader)))
+print(" ".join(sorted(name for name in ("tkinter", "PIL", "face_recognition") if name in sys.modules)))
+"""
+
+
+def test_module_import_skips_gui_and_pil(vg):
+    result = subprocess.run([sys.executable, "-c", LOAD_SCRIPT], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
@@ -0,0 +1,124 @@
+import concurrent.futures
+
+import numpy as np
+import pytest
+
+
+class ManualExecutor:
+    """Stands in for the recognition worker processes; futures complete when a test resolves them"""
+
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, *args):
+        future = concurrent.futures.Future()
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+class FakeUserManager:
+    """One enrolled user; the first value of an encoding is its distance to that user"""
+
+    def __init__(self, vg):
+        self.vg = vg
+        self.last_match = None
+        self.failed_attempts = 0
+
+    def is_locked_out(self):
+        return False
+
+    def clear_failed_attempts(self):
+        self.failed_attempts = 0
+
+    def record_failed_attempt(self):
+        self.failed_attempts += 1
+
+    def match_faces(self, face_encodings, top_k=1, max_distance=None):
+        limit = np.inf if max_distance is None else max_distance
+        return [self.vg.FaceMatch("alice", float(encoding[0]), np.inf, [("alice", float(encoding[0]))])
+                if encoding[0] <= limit else None for encoding in face_encodings]
+
+
+@pytest.fixture
+def config(vg):
+    config = dict(vg.ConfigManager().default_config)
+    config.update(recognition_workers=1, face_recognition_interval=1, recognition_max_age=1000)
+    return config
+
+
+@pytest.fixture
+def executor():
+    return ManualExecutor()
+
+
+@pytest.fixture
+def authenticator(vg, config, executor):
+    authenticator = vg.FaceAuthenticator(FakeUserManager(vg), config)
+    pool = vg.RecognitionWorkerPool(config)
+    pool.executor.shutdown()
+    pool.executor = executor
+    authenticator.recognition_pool = pool
+    return authenticator
+
+
+def analysis_at(vg, left, top=60, size=80):
+    observation = vg.FaceObservation(vg.dlib.rectangle(left, top, left + size, top + size))
+    return vg.FrameAnalysis(np.zeros((240, 320, 3), dtype=np.uint8), None, [observation])
+
+
+def resolve(future, distance):
+    future.set_result([[np.full(128, distance)]])
+
+
+def test_in_flight_limit_caps_submissions(vg, config, executor, authenticator):
+    config["recognition_max_in_flight"] = 2
+    policy = vg.LockPolicy(config, 0.0)
+    for step in range(5):
+        assert policy.evaluate(analysis_at(vg, 100), 2.0 + step * 0.1, authenticator) is None
+    assert len(executor.futures) == 2
+
+    # The result is applied before the interval is checked again, so nothing is resubmitted
+    resolve(executor.futures[0], 0.3)
+    assert policy.evaluate(analysis_at(vg, 100), 2.6, authenticator) is None
+    assert policy.last_recognition_check == 2.6
+    assert len(executor.futures) == 2
+
+
+def test_result_for_previous_face_does_not_verify_new_one(vg, config, executor, authenticator):
+    policy = vg.LockPolicy(config, 0.0)
+    policy.evaluate(analysis_at(vg, 100), 2.0, authenticator)
+    assert len(executor.futures) == 1
+
+    # Another face takes over while the first one's check is still being encoded
+    policy.evaluate(analysis_at(vg, 250), 2.1, authenticator)
+    resolve(executor.futures[0], 0.3)
+    assert policy.evaluate(analysis_at(vg, 250), 2.2, authenticator) is None
+
+    assert not policy.session.verified
+    assert policy.last_recognition_check == 0.0
+    assert authenticator.recognition_pool.stats["other_track"] == 1
+    # The new face gets a check of its own
+    assert len(executor.futures) == 2
+
+
+def test_pending_result_adds_no_evidence_to_a_new_track(vg, executor, authenticator):
+    frame = analysis_at(vg, 100)
+    test = authenticator.sequential_test
+    authenticator.new_track(1)
+    assert authenticator.submit(frame.small_frame, frame.observations, 1.0)
+
+    # The track breaks while the request is pending; its strong match must not count for the new face
+    authenticator.new_track(2)
+    resolve(executor.futures[0], 0.2)
+    assert authenticator.collect(1.1) is None
+    assert test.frames == 0
+    assert test.stats["accepted"] == 0
+
+    # The new face is decided on its own frames only: one borderline frame is not enough
+    assert authenticator.submit(frame.small_frame, frame.observations, 1.2)
+    resolve(executor.futures[1], 0.55)
+    assert authenticator.collect(1.3) is None
+    assert test.frames == 1
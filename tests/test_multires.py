@@ -0,0 +1,40 @@
+import numpy as np
+
+
+class LevelDetector:
+    """Returns a face spanning a fixed fraction of whatever image it is given and records the image widths"""
+
+    name = "fake"
+
+    def __init__(self, vg, face_fraction):
+        self.vg = vg
+        self.face_fraction = face_fraction
+        self.widths = []
+
+    def detect(self, image, upsample=0):
+        height, width = image.shape[:2]
+        self.widths.append(width)
+        face_width = int(width * self.face_fraction)
+        return [self.vg.dlib.rectangle(10, 10, 10 + face_width - 1, 10 + face_width - 1)]
+
+
+def detect_once(vg, face_fraction):
+    detector = LevelDetector(vg, face_fraction)
+    cascade = vg.MultiResolutionDetector(detector, vg.ConfigManager().default_config, vg.FrameBufferPool())
+    faces = cascade(np.zeros((480, 640), dtype=np.uint8))
+    return detector.widths, faces
+
+
+def test_seated_face_is_accepted_at_coarse_level(vg):
+    # A user at a desk is roughly a third of a 640 px wide frame: ~106 px at the 0.5 level
+    widths, faces = detect_once(vg, 1 / 3)
+    assert widths == [320]
+    assert len(faces) == 1
+    assert abs(faces[0].width() - 213) <= 2
+
+
+def test_face_below_hog_window_escalates(vg):
+    # 60 px at the 0.5 level is well under the 80 px HOG window, so the full-size level runs too
+    widths, faces = detect_once(vg, 60 / 320)
+    assert widths == [320, 640]
+    assert len(faces) == 1
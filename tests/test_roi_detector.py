@@ -0,0 +1,36 @@
+import numpy as np
+
+
+class CountingDetector:
+    """Returns a fixed list of faces and counts how often it ran"""
+
+    def __init__(self, faces=()):
+        self.faces = list(faces)
+        self.calls = 0
+
+    def __call__(self, gray, *args):
+        self.calls += 1
+        return list(self.faces)
+
+
+def test_full_frame_miss_stops_region_scans(vg):
+    gray = np.zeros((240, 320), dtype=np.uint8)
+    region_detector = CountingDetector()
+    full_frame_detector = CountingDetector([vg.dlib.rectangle(100, 60, 180, 140)])
+    detector = vg.RoiFaceDetector(region_detector, vg.ConfigManager().default_config, vg.FrameBufferPool(),
+                                  full_frame_detector=full_frame_detector)
+
+    assert detector(gray)
+    assert detector.last_known_faces
+
+    # The face leaves: the region scan and the full-frame fallback both miss
+    full_frame_detector.faces = []
+    assert detector(gray) == []
+    assert region_detector.calls == 1
+    assert detector.last_known_faces == []
+
+    # Without a face to search around, later frames go straight to the full-frame scan
+    for _ in range(3):
+        assert detector(gray) == []
+    assert region_detector.calls == 1
+    assert full_frame_detector.calls == 5
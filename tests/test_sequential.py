@@ -0,0 +1,45 @@
+import pytest
+
+
+@pytest.fixture
+def sprt(vg):
+    return vg.SequentialTest(vg.ConfigManager().default_config)
+
+
+def decide(sprt, distances):
+    """Decision and the number of frames it took"""
+    for frames, distance in enumerate(distances, 1):
+        decision = sprt.add(distance)
+        if decision is not None:
+            return decision, frames
+    return None, len(distances)
+
+
+def test_clear_match_and_clear_stranger_take_one_frame(sprt):
+    assert decide(sprt, [0.3]) == (True, 1)
+    assert decide(sprt, [0.9]) == (False, 1)
+    assert sprt.stats["accepted"] == sprt.stats["rejected"] == 1
+
+
+def test_borderline_frames_accumulate_evidence(sprt):
+    assert decide(sprt, [0.55] * 5) == (True, 4)
+    # A single blurry frame does not reject a face that otherwise matches
+    assert decide(sprt, [0.75, 0.45, 0.4]) == (True, 3)
+    assert decide(sprt, [0.65, 0.5, 0.45]) == (True, 3)
+
+
+def test_undecided_track_is_truncated(sprt):
+    assert decide(sprt, [0.62] * 5) == (False, 5)
+    assert sprt.stats["truncated"] == 1
+    assert sprt.frames == 0
+
+
+def test_distance_beyond_search_limit_rejects_alone(sprt):
+    assert sprt.add(sprt.search_limit) is False
+    assert sprt.add(sprt.search_limit + 1.0) is False
+
+
+def test_reset_drops_evidence(sprt):
+    assert sprt.add(0.5) is None
+    sprt.reset()
+    assert decide(sprt, [0.55] * 3) == (None, 3)
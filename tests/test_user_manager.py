@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def make_manager(vg, tmp_path):
+    security_manager = vg.SecurityManager(str(tmp_path / "security.key"))
+
+    def make(precision):
+        config = dict(vg.ConfigManager().default_config, gallery_precision=precision)
+        return vg.UserManager(security_manager, str(tmp_path / "users.enc"), config)
+    return make
+
+
+@pytest.mark.parametrize("precision", ["float32", "float16", "int8"])
+def test_saved_templates_keep_enrolled_precision(vg, make_manager, precision):
+    rng = np.random.default_rng(0)
+    alice, bob = rng.normal(0.0, 0.1, (3, 128)), rng.normal(0.0, 0.1, (2, 128))
+    manager = make_manager(precision)
+    assert manager.enroll_user("alice", list(alice))
+    assert manager.enroll_user("bob", list(bob))
+    assert manager.gallery.matrix.dtype == np.dtype(precision)
+
+    # Re-saving after a deletion keeps the remaining user's float64 templates as enrolled
+    reloaded = make_manager(precision)
+    assert reloaded.delete_user("bob")
+    saved = reloaded._read_users()
+    assert list(saved) == ["alice"]
+    assert np.array_equal(np.asarray(saved["alice"]), alice)
+    assert reloaded.enrolled_users["alice"][0].dtype == vg.template_dtype(precision)